@@ -5,6 +5,9 @@ from pygame.sprite import Sprite
 class Alien(Sprite):
     """A class to represent a single alien in the fleet"""
 
+    # Every alien shares the same image, so we only load it once.
+    alien_image = None
+
     def __init__(self, ai_game):
         """Initialize the alien and set its starting position"""
         super().__init__()
@@ -12,16 +15,18 @@ class Alien(Sprite):
         self.settings = ai_game.settings
 
         # Load the alien image and set its rect attribute
-        self.image = pygame.image.load('Images/alien.bmp')
+        if Alien.alien_image is None:
+            Alien.alien_image = pygame.image.load('Images/alien.bmp')
+        self.image = Alien.alien_image
         self.rect = self.image.get_rect()
 
         # Start each alien near the top left of the screen
         self.rect.x = self.rect.width
         self.rect.y = self.rect.height
 
-        """Store the alien's exact horizontal position. We're concern with the
-        horizontal speed, so we'll track the horizontal position of each alien
-        precisely."""
+        """Store the alien's horizontal position inside the fleet. The fleet
+        moves as one block, so the distance it has travelled is kept once,
+        in 'settings.fleet_offset', and added to every alien's position."""
         self.x = float(self.rect.x)
 
     def check_edges(self):
@@ -32,10 +37,10 @@ class Alien(Sprite):
             return True
 
     def update(self):
-        """Move the alien to the right or left."""
-        self.x += (self.settings.alien_speed *
-                   self.settings.fleet_direction)
-        self.rect.x = self.x
+        """Move the alien to where the fleet is now."""
+        """Every alien adds the same whole number of pixels to its place in
+        the fleet, so the columns stay exactly in step."""
+        self.rect.x = self.x + round(self.settings.fleet_offset)
 
     """This alien class doesn't need a method for drawing it to the
     screen; instead, we'll use a Pygame group method that automatically
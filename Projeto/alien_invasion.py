@@ -1,5 +1,7 @@
+import os
 import sys
-from time import sleep
+import argparse
+from time import sleep, perf_counter
 
 """SYS MODULE - provides functions that allow us to interact with interpreter
 directly like exit the game when the player quits"""
@@ -14,34 +16,32 @@ from ProjetoAlienInvasion.Projeto.button import Button
 from ProjetoAlienInvasion.Projeto.ship import Ship
 from ProjetoAlienInvasion.Projeto.bullet import Bullet
 from ProjetoAlienInvasion.Projeto.alien import Alien
+from ProjetoAlienInvasion.Projeto.fleet import FleetSurface
+from ProjetoAlienInvasion.Projeto.autopilot import Autopilot
+from ProjetoAlienInvasion.Projeto.metrics import Metrics
+from ProjetoAlienInvasion.Projeto.capture import FrameRecorder
+from ProjetoAlienInvasion.Projeto.snapshot import save_state, load_state
 
 
 class AlienInvasion:
     """Overall class to manage game assets and behavior"""
 
-    def __init__(self):
+    def __init__(self, settings=None):
         """Initialize the game, and create game resources"""
 
-        # This function initializes the background settings that Pygame needs to work properly
-        pygame.init()
-
-        # Here we create a instance of Settings
-        self.settings = Settings()
+        # Here we create a instance of Settings, unless one was given to us.
+        self.settings = settings or Settings()
 
-        """self.screen - create a display window, on which we'll draw all the game's 
-           graphical elements. The argument (1200, 800) is a tuple that defines the dimensions
-           of the game window. pygame.display.set_mode represents the entire game window
-           - Surface is like a blank piece of paper, we create a special surface with:"""
-        self.screen = pygame.display.set_mode((self.settings.screen_width, self.settings.screen_height))
+        """SDL reads the video driver when pygame is initialized, so the
+        dummy driver must be selected before calling 'pygame.init()'."""
+        if self.settings.headless:
+            os.environ['SDL_VIDEODRIVER'] = 'dummy'
 
-        """full screen mode, the (0, 0) tells pygame to figure out a window
-        size that fill the screen."""
-        # self.screen = pygame.display.set_mode((0, 0), pygame.FULLSCREEN)
+        # This function initializes the background settings that Pygame needs to work properly
+        pygame.init()
 
-        """We use the 'width' and 'height' attributes of the screen's
-        rect to update the 'settings' object"""
-        # self.settings.screen_width = self.screen.get_rect().width
-        # self.settings.screen_height = self.screen.get_rect().height
+        # Create the game window and the surface we'll draw the game on.
+        self._create_display()
 
         # set the pygame window name
         pygame.display.set_caption('Alien Invasion')
@@ -70,6 +70,9 @@ class AlienInvasion:
         # We create a group to hold the fleet of aliens
         self.aliens = pygame.sprite.Group()
 
+        # The fleet surface draws every alien in the fleet with one blit.
+        self.fleet_surface = FleetSurface(self)
+
         self._create_fleet()
 
         # Make buttons.
@@ -77,16 +80,91 @@ class AlienInvasion:
         self.medium_button = Button(self, 'Medium')
         self.hard_button = Button(self, 'Hard')
 
+        # State saved with the quick-save key, restored with quick-load.
+        self.quick_save = None
+
+        # The menu needs to be drawn when it's first shown.
+        self.menu_dirty = True
+
+        # The autopilot replaces the keyboard when it is enabled.
+        self.autopilot = None
+        if self.settings.autopilot:
+            self.autopilot = Autopilot(self)
+
+        # The metrics registry is only created when it's enabled.
+        self.metrics = None
+        if self.settings.metrics_enabled:
+            self.metrics = Metrics(self)
+
+        # The recorder copies frames to a background encoder.
+        self.recorder = FrameRecorder(self)
+        if self.settings.capture_enabled:
+            self.recorder.start()
+
+    def _create_display(self):
+        """Create the display, and the surface the game is drawn on."""
+        """self.screen - the surface on which we'll draw all the game's
+           graphical elements, at the logical resolution from settings.
+           self.display - the game window itself. pygame.display.set_mode
+           represents the entire game window. When both are the same surface
+           we draw straight to the window."""
+        size = (self.settings.screen_width, self.settings.screen_height)
+        flags = pygame.FULLSCREEN if self.settings.fullscreen else 0
+
+        # The dummy video driver used in headless mode can't scale.
+        scaling = None if self.settings.headless else self.settings.display_scaling
+
+        """Fullscreen without scaling would draw at the monitor's resolution
+        and change the size of the game, so SDL scales it instead."""
+        if self.settings.fullscreen and not self.settings.headless:
+            scaling = scaling or 'sdl'
+
+        if scaling == 'sdl':
+            """The SCALED flag makes SDL scale the logical surface to the
+            window or the monitor for us, and maps the mouse position back
+            to logical coordinates."""
+            self.display = pygame.display.set_mode(size, flags | pygame.SCALED)
+            self.screen = self.display
+        elif scaling == 'software':
+            if self.settings.fullscreen:
+                display_size = (0, 0)
+            else:
+                display_size = (self.settings.display_width,
+                                self.settings.display_height)
+            self.display = pygame.display.set_mode(display_size, flags)
+            self.screen = pygame.Surface(size).convert()
+        else:
+            self.display = pygame.display.set_mode(size)
+            self.screen = self.display
+
     def run_game(self):
         """The game is controlled by this method.
         Start the main loop for the game"""
+        self.start_time = perf_counter()
+        frame_start = self.start_time
+
+        if self.metrics:
+            self.metrics.start()
+
         while True:
             """To call a method from within a class, use dot notation
             with the variable 'self' and the name of the method. We call
             the method from inside the 'while' loop in 'run_game()'."""
             # Main Program
+            if self._menu_is_idle():
+                if self.metrics:
+                    self.metrics.observe_idle()
+                self._idle_menu()
+                frame_start = perf_counter()
+                continue
+
             self._check_events()
 
+            if self.autopilot:
+                if self.autopilot.finished():
+                    self._quit_game()
+                self.autopilot.update()
+
             if self.stats.game_active:
                 self.ship.update()
                 self._update_bullets()
@@ -94,10 +172,41 @@ class AlienInvasion:
             
             self._update_screen()
 
+            # Count the time this frame took.
+            if self.metrics:
+                frame_end = perf_counter()
+                self.metrics.observe_frame(frame_end - frame_start)
+                frame_start = frame_end
+
     """A 'helper method' does work inside a class but isn't meant to be 
     called through an instance. In python, a single leading underscore 
     indicates a helper method."""
-    def _check_events(self):
+    def _menu_is_idle(self):
+        """Return True if the menu is showing and nothing is animating."""
+        return (self.settings.idle_menu and not self.stats.game_active
+                and not self.autopilot)
+
+    def _idle_menu(self):
+        """Wait for events while the menu is showing, and redraw on change."""
+        """Nothing moves on the menu until the player clicks a button, so
+        'pygame.event.wait()' lets the game sleep until an event arrives or
+        the timeout runs out, instead of redrawing the same screen."""
+        if self.menu_dirty:
+            self._update_screen()
+            self.menu_dirty = False
+
+        event = pygame.event.wait(self.settings.idle_timeout)
+        if event.type == pygame.NOEVENT:
+            return
+
+        # The window needs to be redrawn if it was uncovered or changed.
+        if event.type in (pygame.VIDEOEXPOSE, pygame.VIDEORESIZE,
+                          pygame.WINDOWEXPOSED, pygame.WINDOWSIZECHANGED):
+            self.menu_dirty = True
+
+        self._check_events([event] + pygame.event.get())
+
+    def _check_events(self, events=None):
         """Respond to key presses and mouse events"""
         """-A event is an action that the user performs while playing the game,
         such as pressing a key or moving the mouse.
@@ -106,13 +215,14 @@ class AlienInvasion:
         event loop.
         -To access the events that pygame detects, we'll use the
         'pygame.event.get()' function. This function returns a list of
-        events that have taken place since the last time this function was called."""
-        for event in pygame.event.get():  # watch for keyboard and mouse events
+        events that have taken place since the last time this function was called.
+        -The idle menu passes in the events it has already waited for."""
+        if events is None:
+            events = pygame.event.get()
+
+        for event in events:  # watch for keyboard and mouse events
             if event.type == pygame.QUIT:  # when the player clicks the game window's close button is 'pygame.QUIT'
-                if self.stats.score >= self.stats.high_score:
-                    with open('highscore.json', 'w') as f:
-                        json.dump(self.stats.high_score, f)
-                sys.exit()  # the interpreter will close the game
+                self._quit_game()
 
             # Each keypress is registered as a KEYDOWN event.
             elif event.type == pygame.KEYDOWN:
@@ -128,9 +238,38 @@ class AlienInvasion:
                 """We use 'pygame.mouse.get_pos()' which returns a tuple 
                 containing the mouse cursor's x- and y-coordinates when the
                 mouse button is clicked"""
-                mouse_pos = pygame.mouse.get_pos()
+                mouse_pos = self._get_mouse_pos()
                 self._check_play_button(mouse_pos)
 
+    def _quit_game(self):
+        """Save the high score and close the game."""
+        # Report the throughput of a workload run driven by the autopilot.
+        if self.autopilot:
+            elapsed = perf_counter() - self.start_time
+            print(f"Autopilot: {self.autopilot.frames} frames in "
+                  f"{elapsed:.2f}s ({self.autopilot.frames / elapsed:.1f} fps)")
+
+        # The autopilot's score isn't a player's high score.
+        if not self.autopilot and self.stats.score >= self.stats.high_score:
+            with open('highscore.json', 'w') as f:
+                json.dump(self.stats.high_score, f)
+
+        if self.metrics:
+            self.metrics.stop()
+
+        # Let the encoder write the frames that are still queued.
+        self.recorder.stop()
+
+        sys.exit()  # the interpreter will close the game
+
+    def _get_mouse_pos(self):
+        """Return the mouse position in the game's logical coordinates."""
+        mouse_x, mouse_y = pygame.mouse.get_pos()
+        if self.screen is not self.display:
+            mouse_x = mouse_x * self.screen.get_width() // self.display.get_width()
+            mouse_y = mouse_y * self.screen.get_height() // self.display.get_height()
+        return mouse_x, mouse_y
+
     def _check_play_button(self, mouse_pos):
         """Start a new game when the players selects a certain difficulty."""
 
@@ -190,7 +329,7 @@ class AlienInvasion:
             self.ship.moving_left = True
 
         elif event.key == pygame.K_q:  # if I press the 'q' key the game closes
-            sys.exit()
+            self._quit_game()
 
         elif event.key == pygame.K_SPACE:
             self._fire_bullet()
@@ -198,6 +337,19 @@ class AlienInvasion:
         elif event.key == pygame.K_p:
             self._start_game()
 
+        elif event.key == pygame.K_F5:  # quick-save the game
+            self.quick_save = save_state(self)
+
+        elif event.key == pygame.K_F9:  # quick-load the last quick-save
+            if self.quick_save:
+                load_state(self, self.quick_save)
+
+        elif event.key == pygame.K_r:  # start or stop recording the game
+            if self.recorder.recording:
+                self.recorder.stop()
+            else:
+                self.recorder.start()
+
     def _check_keyup_events(self, event):
         """responds to key releases"""
         if event.key == pygame.K_RIGHT:  # key event
@@ -240,6 +392,7 @@ class AlienInvasion:
         if collisions:
             for aliens in collisions.values():
                 self.stats.score += self.settings.alien_points * len(aliens)
+                self.fleet_surface.remove(aliens)
             self.sb.prep_score()
             self.sb.check_high_score()
 
@@ -260,6 +413,9 @@ class AlienInvasion:
 
     def _create_fleet(self):
         """Create the fleet of aliens."""
+        # A new fleet starts where its aliens are created.
+        self.settings.fleet_offset = 0.0
+
         # Create an alien and find the number of aliens in a row.
         # Spacing between each alien is equal to one alien width.
         alien = Alien(self)
@@ -306,6 +462,10 @@ class AlienInvasion:
             for alien_number in range(number_aliens_x):
                 self._create_alien(alien_number, row_number)
 
+        # Composite the new fleet once, it's redrawn from this surface.
+        if self.settings.composite_fleet:
+            self.fleet_surface.build()
+
     def _create_alien(self, alien_number, row_number):
         """Create an alien and place it in the row"""
         alien = Alien(self)
@@ -339,6 +499,10 @@ class AlienInvasion:
         """Check if the fleet is at an edge,
         then update the positions of all aliens in the fleet."""
         self._check_fleet_edges()
+
+        # Move the fleet, then place every alien from the fleet's offset.
+        self.settings.fleet_offset += (self.settings.alien_speed *
+                                       self.settings.fleet_direction)
         self.aliens.update()
 
         """The 'spritecollideany()' takes two arguments: a sprite and a 
@@ -371,10 +535,12 @@ class AlienInvasion:
             self._create_fleet()
             self.ship.center_ship()
 
-            # Pause.
-            sleep(0.5)
+            # Pause, unless the autopilot is running at full speed.
+            if not self.autopilot:
+                sleep(0.5)
         else:
             self.stats.game_active = False
+            self.menu_dirty = True
 
             # Show the mouse cursor.
             pygame.mouse.set_visible(True)
@@ -405,7 +571,10 @@ class AlienInvasion:
         group at the position defined by its rect attribute. The draw() 
         method requires one argument: a surface on which to draw the elements
         from the group."""
-        self.aliens.draw(self.screen)
+        if self.settings.composite_fleet:
+            self.fleet_surface.draw()
+        else:
+            self.aliens.draw(self.screen)
 
         # Draw the score information.
         self.sb.show_score()
@@ -416,11 +585,67 @@ class AlienInvasion:
             self.medium_button.draw_button()
             self.hard_button.draw_button()
 
+        # Record the frame at the game's logical resolution.
+        if self.recorder.recording:
+            self.recorder.capture(self.screen)
+
+        # Scale the game to the display if we didn't draw straight to it.
+        if self.screen is not self.display:
+            pygame.transform.scale(self.screen, self.display.get_size(),
+                                   self.display)
+
         # update the contents of the entire display
         pygame.display.flip()
 
 
+def parse_args():
+    """Read the command line options used to configure a game."""
+    parser = argparse.ArgumentParser(description='Play Alien Invasion.')
+    parser.add_argument('--autopilot', action='store_true',
+                        help='let the autopilot play instead of the keyboard')
+    parser.add_argument('--difficulty', default='Medium',
+                        choices=['Easy', 'Medium', 'Hard'],
+                        help='difficulty chosen by the autopilot')
+    parser.add_argument('--frames', type=int, default=None,
+                        help='quit after the autopilot drives this many frames')
+    parser.add_argument('--headless', action='store_true',
+                        help='run without opening a window')
+    parser.add_argument('--metrics', action='store_true',
+                        help='serve metrics on localhost and write snapshots')
+    parser.add_argument('--metrics-port', type=int, default=9108,
+                        help='port of the metrics endpoint')
+    parser.add_argument('--record', choices=['png', 'gif'], default=None,
+                        help='record the game as a PNG sequence or a GIF')
+    parser.add_argument('--fullscreen', action='store_true',
+                        help='run the game in fullscreen mode')
+    parser.add_argument('--scaling', choices=['sdl', 'software'], default=None,
+                        help='draw at the logical resolution and scale it to '
+                             'the display')
+    parser.add_argument('--resolution', default=None,
+                        help="logical resolution to draw at, such as '960x640'")
+    return parser.parse_args()
+
+
 if __name__ == '__main__':
+    args = parse_args()
+
+    # Apply the command line options to the game settings.
+    settings = Settings()
+    settings.autopilot = args.autopilot
+    settings.autopilot_difficulty = args.difficulty
+    settings.autopilot_frames = args.frames
+    settings.headless = args.headless
+    settings.metrics_enabled = args.metrics
+    settings.metrics_port = args.metrics_port
+    if args.record:
+        settings.capture_enabled = True
+        settings.capture_format = args.record
+    settings.fullscreen = args.fullscreen
+    settings.display_scaling = args.scaling
+    if args.resolution:
+        width, height = args.resolution.lower().split('x')
+        settings.screen_width, settings.screen_height = int(width), int(height)
+
     # make a game instance, and run the game
-    ai = AlienInvasion()
+    ai = AlienInvasion(settings)
     ai.run_game()
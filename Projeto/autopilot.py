@@ -0,0 +1,122 @@
+class Autopilot:
+    """A class that plays Alien Invasion without a human at the keyboard."""
+
+    def __init__(self, ai_game):
+        """Initialize the autopilot and the game resources it controls."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.ship = ai_game.ship
+        self.aliens = ai_game.aliens
+        self.bullets = ai_game.bullets
+        self.stats = ai_game.stats
+
+        # Difficulty used every time the autopilot starts a new game.
+        self.difficulty = self.settings.autopilot_difficulty
+
+        # Number of frames driven so far, used to stop a workload run.
+        self.frames = 0
+
+    def update(self):
+        """Steer the ship toward the best column of aliens and fire."""
+        self.frames += 1
+
+        if not self.stats.game_active:
+            self._start_game()
+            return
+
+        target_x = self._target_column()
+        if target_x is None:
+            self.ship.moving_right = False
+            self.ship.moving_left = False
+            return
+
+        """We stop moving once the ship is within one step of the target,
+        otherwise the ship would keep jumping from one side to the other."""
+        offset = target_x - self.ship.rect.centerx
+        self.ship.moving_right = offset > self.settings.ship_speed
+        self.ship.moving_left = offset < -self.settings.ship_speed
+
+        # Only fire when the ship is lined up and a bullet is available.
+        if (not self.ship.moving_right and not self.ship.moving_left and
+                len(self.bullets) < self.settings.bullets_allowed):
+            self.ai_game._fire_bullet()
+
+    def finished(self):
+        """Return True if the autopilot has driven all of its frames."""
+        max_frames = self.settings.autopilot_frames
+        return max_frames is not None and self.frames >= max_frames
+
+    def _target_column(self):
+        """Return where the ship should be to hit the best column."""
+        """Each column is aimed at its lowest alien that no bullet is on
+        its way to already, and we aim where that alien will be when a
+        bullet fired now reaches it, not where it is now. The best column
+        is the one that takes the fewest frames to hit: moving the ship
+        under it, plus the bullet's flight."""
+        if not self.aliens:
+            return None
+        self._measure_fleet()
+
+        columns = {}
+        for alien in self.aliens.sprites():
+            columns.setdefault(alien.rect.x, []).append(alien)
+
+        ship_x = self.ship.rect.centerx
+        target_x = None
+        best_frames = None
+        for column in columns.values():
+            column.sort(key=lambda alien: alien.rect.bottom, reverse=True)
+            for alien in column:
+                if not self._is_targeted(alien):
+                    alien_x = self._lead(alien, self.ship.rect.top)
+                    frames = (abs(alien_x - ship_x) / self.settings.ship_speed +
+                              self._flight_frames(alien, self.ship.rect.top))
+                    if best_frames is None or frames < best_frames:
+                        target_x, best_frames = alien_x, frames
+                    break
+        return target_x
+
+    def _measure_fleet(self):
+        """Store how far the fleet can move left and right from here."""
+        screen_width = self.ai_game.screen.get_rect().width
+        self.room_left = min(alien.rect.left for alien in self.aliens.sprites())
+        self.room_right = screen_width - max(
+            alien.rect.right for alien in self.aliens.sprites())
+
+    def _is_targeted(self, alien):
+        """Return True if a bullet in flight is going to hit the alien."""
+        for bullet in self.bullets.sprites():
+            if bullet.rect.top > alien.rect.bottom:
+                alien_x = self._lead(alien, bullet.rect.top)
+                if abs(alien_x - bullet.rect.centerx) < alien.rect.width / 2:
+                    return True
+        return False
+
+    def _flight_frames(self, alien, bullet_top):
+        """Return how many frames a bullet at 'bullet_top' needs to reach
+        the alien."""
+        return (bullet_top - alien.rect.bottom) / self.settings.bullet_speed
+
+    def _lead(self, alien, bullet_top):
+        """Return the alien's x-coordinate when a bullet at 'bullet_top'
+        reaches it."""
+        """The fleet bounces between the edges of the screen, so its
+        position follows a triangle wave: we unfold the bounces by taking
+        the distance travelled modulo a round trip."""
+        span = self.room_left + self.room_right
+        if span <= 0:
+            return alien.rect.centerx
+
+        travel = (self._flight_frames(alien, bullet_top) *
+                  self.settings.alien_speed * self.settings.fleet_direction)
+        position = (self.room_left + travel) % (2 * span)
+        if position > span:
+            position = 2 * span - position
+        return alien.rect.centerx + position - self.room_left
+
+    def _start_game(self):
+        """Start a new game through the same path as the difficulty buttons."""
+        difficulty = self.difficulty.capitalize()
+        self.ai_game._check_difficulty(difficulty == 'Easy',
+                                       difficulty == 'Medium',
+                                       difficulty == 'Hard')
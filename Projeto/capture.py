@@ -0,0 +1,159 @@
+import os
+import queue
+import tempfile
+from collections import deque
+import multiprocessing
+from multiprocessing import shared_memory
+from time import strftime
+
+import pygame
+
+try:
+    from PIL import Image  # Pillow is only needed to record GIFs.
+except ImportError:
+    Image = None
+
+
+class FrameRecorder:
+    """A class to record frames of the game on a background process."""
+
+    def __init__(self, ai_game):
+        """Initialize the recorder attributes."""
+        self.settings = ai_game.settings
+        self.screen = ai_game.screen
+
+        self.encoder = None
+        self.path = None
+
+        self.frame_count = 0
+        self.captured = 0
+        self.dropped = 0
+
+    @property
+    def recording(self):
+        """Return True while the recorder is running."""
+        return self.encoder is not None
+
+    def start(self):
+        """Start recording into a new folder under 'capture_dir'."""
+        if self.settings.capture_format == 'gif' and Image is None:
+            raise RuntimeError("Recording GIFs needs Pillow: 'pip install Pillow'")
+
+        # Recordings started in the same second still get their own folder.
+        os.makedirs(self.settings.capture_dir, exist_ok=True)
+        self.path = tempfile.mkdtemp(prefix=strftime('%Y%m%d-%H%M%S-'),
+                                     dir=self.settings.capture_dir)
+
+        """The ring buffer is a block of shared memory split into slots of
+        one frame each. A frame is copied into a slot as the raw bytes of
+        the screen, in the screen's own pixel format, which is a plain
+        memory copy. The encoder process is told that format, and does any
+        conversion there, away from the game loop.
+        Slot numbers go to the encoder through 'full_slots', and come back
+        through 'free_slots' once the frame has been written."""
+        size = self.screen.get_size()
+        self.slot_bytes = self.screen.get_pitch() * size[1]
+        slots = max(2, self.settings.capture_buffer_bytes // self.slot_bytes)
+        self.memory = shared_memory.SharedMemory(create=True,
+                                                 size=self.slot_bytes * slots)
+        pixel_format = (self.screen.get_bitsize(), self.screen.get_masks())
+
+        self.free_slots = multiprocessing.Queue()
+        self.full_slots = multiprocessing.Queue()
+        for slot in range(slots):
+            self.free_slots.put(slot)
+
+        self.frame_count = 0
+        self.captured = 0
+        self.dropped = 0
+
+        """Encoding runs in its own process, because saving an image holds
+        Python's global lock and a thread would slow the game loop down."""
+        self.encoder = multiprocessing.Process(
+            target=_encode, daemon=True,
+            args=(self.memory.name, size, pixel_format, self.full_slots,
+                  self.free_slots, self.path, self.settings))
+        self.encoder.start()
+
+    def stop(self):
+        """Stop recording and wait for the encoder to finish."""
+        if not self.recording:
+            return
+
+        # 'None' tells the encoder there are no more frames.
+        self.full_slots.put(None)
+        self.encoder.join()
+        self.encoder = None
+
+        self.memory.close()
+        self.memory.unlink()
+
+        print(f"Recorded {self.captured} frames to {self.path} "
+              f"({self.dropped} dropped)")
+
+    def capture(self, surface):
+        """Copy the surface into a free slot of the ring buffer."""
+        self.frame_count += 1
+        if self.frame_count % self.settings.capture_every:
+            return
+
+        # Drop the frame instead of waiting when the encoder falls behind.
+        try:
+            slot = self.free_slots.get_nowait()
+        except queue.Empty:
+            self.dropped += 1
+            return
+
+        start = slot * self.slot_bytes
+        self.memory.buf[start:start + self.slot_bytes] = surface.get_buffer()
+        self.full_slots.put(slot)
+        self.captured += 1
+
+
+def _encode(memory_name, size, pixel_format, full_slots, free_slots, path,
+            settings):
+    """Encode frames from the ring buffer until the recorder is stopped."""
+    memory = shared_memory.SharedMemory(name=memory_name)
+
+    # A surface in the screen's pixel format, to read the slots back.
+    bitsize, masks = pixel_format
+    frame = pygame.Surface(size, 0, bitsize, masks)
+    slot_bytes = frame.get_pitch() * size[1]
+    index = 0
+
+    """A GIF can only be written once all of its frames are known, so we
+    keep only the last 'capture_gif_frames' of them, scaled down, and the
+    encoder's memory stays bounded however long the recording is."""
+    gif_frames = deque(maxlen=settings.capture_gif_frames)
+    gif_size = (int(size[0] * settings.capture_gif_scale),
+                int(size[1] * settings.capture_gif_scale))
+
+    while True:
+        slot = full_slots.get()
+        if slot is None:
+            break
+
+        pixels = memory.buf[slot * slot_bytes:(slot + 1) * slot_bytes]
+        frame.get_buffer().write(bytes(pixels))
+        pixels.release()
+
+        if settings.capture_format == 'gif':
+            # Smaller frames with a palette are also faster to encode.
+            image = Image.frombytes('RGB', size,
+                                    pygame.image.tobytes(frame, 'RGB'))
+            image = image.resize(gif_size)
+            gif_frames.append(image.convert('P', palette=Image.ADAPTIVE))
+        else:
+            pygame.image.save(frame, os.path.join(path, f'frame_{index:06d}.png'))
+
+        # The slot can be used for a new frame again.
+        free_slots.put(slot)
+        index += 1
+
+    memory.close()
+
+    if gif_frames:
+        first = gif_frames.popleft()
+        first.save(os.path.join(path, 'recording.gif'),
+                   save_all=True, append_images=list(gif_frames),
+                   duration=settings.capture_frame_duration, loop=0)
@@ -0,0 +1,75 @@
+import pygame
+
+
+class FleetSurface:
+    """A class to draw the whole fleet of aliens with a single blit."""
+
+    def __init__(self, ai_game):
+        """Initialize the fleet surface attributes."""
+        self.screen = ai_game.screen
+        self.settings = ai_game.settings
+        self.aliens = ai_game.aliens
+
+        """The fleet moves as one rigid formation (every alien is placed from
+        'settings.fleet_offset'), so each alien keeps the same position
+        inside the surface. 'cells' maps each alien to the rect it was
+        drawn to inside the surface."""
+        self.image = None
+        self.cells = {}
+
+        # The surface is built again on the next draw when this is set.
+        self.dirty = False
+
+    def build(self):
+        """Composite every alien of the fleet into one surface."""
+        self.dirty = False
+        self.cells = {}
+        aliens = self.aliens.sprites()
+        if not aliens:
+            self.image = None
+            return
+
+        # Find the smallest rect that holds the whole fleet.
+        fleet_rect = aliens[0].rect.unionall([alien.rect for alien in aliens])
+
+        # The surface is made in the screen's pixel format.
+        self.image = pygame.Surface(fleet_rect.size, 0, self.screen)
+        self.image.fill(self.settings.bg_color)
+
+        for alien in aliens:
+            cell = alien.rect.move(-fleet_rect.x, -fleet_rect.y)
+            self.image.blit(alien.image, cell)
+            self.cells[alien] = cell
+
+        """The background color is used as the colorkey, so the empty space
+        between the aliens is transparent when we blit the surface.
+        RLEACCEL stores the surface as runs of visible pixels, so the blit
+        skips the empty space instead of testing every pixel of it."""
+        self.image.set_colorkey(self.settings.bg_color, pygame.RLEACCEL)
+
+    def remove(self, aliens):
+        """Erase the cells of aliens that have been destroyed."""
+        """Changing an RLE surface decodes it first, and SDL encodes it
+        again when it's unlocked. Holding one lock for all the cells means
+        we only pay for that once."""
+        cells = [self.cells.pop(alien) for alien in aliens if alien in self.cells]
+        if not cells:
+            return
+
+        self.image.lock()
+        for cell in cells:
+            self.image.fill(self.settings.bg_color, cell)
+        self.image.unlock()
+
+    def draw(self):
+        """Draw the fleet at its current position."""
+        if self.dirty:
+            self.build()
+        if not self.cells:
+            return
+
+        """Any alien still alive tells us where the fleet is, because its
+        position on the screen minus its cell gives the fleet's offset."""
+        alien, cell = next(iter(self.cells.items()))
+        self.screen.blit(self.image, (alien.rect.x - cell.x,
+                                      alien.rect.y - cell.y))
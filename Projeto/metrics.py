@@ -0,0 +1,207 @@
+import os
+import sys
+import json
+import threading
+from bisect import bisect_left
+from time import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+class Metrics:
+    """A class to collect runtime metrics of a running game."""
+
+    # Upper bounds, in seconds, of the frame time histogram buckets.
+    FRAME_BUCKETS = (0.001, 0.002, 0.004, 0.008, 0.0167, 0.0333,
+                     0.05, 0.1, 0.25, 0.5, 1.0)
+
+    def __init__(self, ai_game):
+        """Initialize the metrics registry."""
+        self.ai_game = ai_game
+        self.settings = ai_game.settings
+        self.stats = ai_game.stats
+
+        """Counting a frame only touches these few attributes, everything
+        else is read from the game when the metrics are collected."""
+        self.frames = 0
+        self.frame_time_sum = 0.0
+        self.frame_time_avg = 0.0
+        # The last bucket counts frames slower than every bound (+Inf).
+        self.frame_buckets = [0] * (len(self.FRAME_BUCKETS) + 1)
+
+        self.start_time = time()
+        self.server = None
+        self.stop_event = threading.Event()
+        self.snapshot_thread = None
+
+    def observe_frame(self, frame_time):
+        """Count one frame that took 'frame_time' seconds."""
+        self.frames += 1
+        self.frame_time_sum += frame_time
+        self.frame_buckets[bisect_left(self.FRAME_BUCKETS, frame_time)] += 1
+
+        """Moving average of the frame time, used to report the current FPS.
+        It starts from the first frame, not from 0, so the first reports
+        aren't inflated."""
+        if self.frame_time_avg:
+            self.frame_time_avg += 0.05 * (frame_time - self.frame_time_avg)
+        else:
+            self.frame_time_avg = frame_time
+
+    def observe_idle(self):
+        """Note that the game is waiting on the menu and drawing nothing."""
+        """The FPS reads 0 while idle, and starts again from the first frame
+        drawn after it instead of from the last rate of the game."""
+        self.frame_time_avg = 0.0
+
+    def collect(self):
+        """Return a dictionary with the current value of every metric."""
+        fps = 1 / self.frame_time_avg if self.frame_time_avg else 0.0
+        return {
+            'timestamp': time(),
+            'uptime_seconds': time() - self.start_time,
+            'fps': fps,
+            'frames_total': self.frames,
+            'frame_time_seconds_sum': self.frame_time_sum,
+            'frame_time_seconds_buckets': list(self.frame_buckets),
+            'bullets': len(self.ai_game.bullets),
+            'aliens': len(self.ai_game.aliens),
+            'level': self.stats.level,
+            'score': self.stats.score,
+            'game_active': int(self.stats.game_active),
+            'rss_bytes': _read_rss(),
+            'peak_rss_bytes': _read_peak_rss(),
+        }
+
+    def to_prometheus(self):
+        """Return the metrics in the Prometheus text format."""
+        values = self.collect()
+        lines = []
+
+        def add(name, kind, help_text, value):
+            lines.append(f'# HELP alien_invasion_{name} {help_text}')
+            lines.append(f'# TYPE alien_invasion_{name} {kind}')
+            lines.append(f'alien_invasion_{name} {value}')
+
+        add('uptime_seconds', 'gauge', 'Seconds since the metrics were started.',
+            values['uptime_seconds'])
+        add('fps', 'gauge', 'Frames per second over the last few frames.',
+            values['fps'])
+        add('frames_total', 'counter', 'Frames drawn since the game started.',
+            values['frames_total'])
+
+        """Prometheus histogram buckets are cumulative, each one counts the
+        frames that were at least as fast as its upper bound."""
+        name = 'alien_invasion_frame_time_seconds'
+        lines.append(f'# HELP {name} Time taken by each frame.')
+        lines.append(f'# TYPE {name} histogram')
+        cumulative = 0
+        bounds = [str(bound) for bound in self.FRAME_BUCKETS] + ['+Inf']
+        for bound, count in zip(bounds, values['frame_time_seconds_buckets']):
+            cumulative += count
+            lines.append(f'{name}_bucket{{le="{bound}"}} {cumulative}')
+        lines.append(f'{name}_sum {values["frame_time_seconds_sum"]}')
+        lines.append(f'{name}_count {cumulative}')
+
+        add('bullets', 'gauge', 'Bullets currently on the screen.',
+            values['bullets'])
+        add('aliens', 'gauge', 'Aliens currently in the fleet.',
+            values['aliens'])
+        add('level', 'gauge', 'Current level.', values['level'])
+        add('score', 'gauge', 'Current score.', values['score'])
+        add('game_active', 'gauge', '1 while a game is being played.',
+            values['game_active'])
+        if values['rss_bytes'] is not None:
+            add('rss_bytes', 'gauge', 'Resident memory of the game process.',
+                values['rss_bytes'])
+        if values['peak_rss_bytes'] is not None:
+            add('peak_rss_bytes', 'gauge',
+                'Peak resident memory of the game process.',
+                values['peak_rss_bytes'])
+
+        return '\n'.join(lines) + '\n'
+
+    def write_snapshot(self):
+        """Append the current metrics as one line of the snapshot file."""
+        with open(self.settings.metrics_snapshot_path, 'a') as f:
+            f.write(json.dumps(self.collect()) + '\n')
+
+    def start(self):
+        """Start the HTTP endpoint and the periodic snapshots."""
+        """Both run on daemon threads, so they never keep the game from
+        closing and never block the main loop."""
+        try:
+            self.server = ThreadingHTTPServer(
+                ('127.0.0.1', self.settings.metrics_port), _MetricsHandler)
+        except OSError as error:
+            # The game is more important than its metrics endpoint.
+            print(f"Metrics endpoint disabled, can't use port "
+                  f"{self.settings.metrics_port}: {error}")
+        else:
+            self.server.metrics = self
+            threading.Thread(target=self.server.serve_forever,
+                             daemon=True).start()
+
+        if self.settings.metrics_snapshot_path:
+            self.snapshot_thread = threading.Thread(
+                target=self._snapshot_loop, daemon=True)
+            self.snapshot_thread.start()
+
+    def stop(self):
+        """Stop the HTTP endpoint and write a last snapshot."""
+        self.stop_event.set()
+        if self.server:
+            self.server.shutdown()
+            self.server.server_close()
+        if self.snapshot_thread:
+            self.snapshot_thread.join()
+            self.write_snapshot()
+
+    def _snapshot_loop(self):
+        """Write a snapshot every 'metrics_snapshot_interval' seconds."""
+        while not self.stop_event.wait(self.settings.metrics_snapshot_interval):
+            self.write_snapshot()
+
+
+class _MetricsHandler(BaseHTTPRequestHandler):
+    """Serve the metrics of the game on '/metrics'."""
+
+    def do_GET(self):
+        """Respond with the metrics in the Prometheus text format."""
+        if self.path != '/metrics':
+            self.send_error(404)
+            return
+
+        body = self.server.metrics.to_prometheus().encode('utf-8')
+        self.send_response(200)
+        self.send_header('Content-Type', 'text/plain; version=0.0.4')
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        """Don't print a line to the terminal for every scrape."""
+
+
+def _read_rss():
+    """Return the resident memory of the process in bytes, if we can."""
+    """Only Linux has /proc, elsewhere there's no current value to report."""
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def _read_peak_rss():
+    """Return the peak resident memory of the process in bytes, if we can."""
+    """The 'resource' module doesn't exist on Windows. 'ru_maxrss' is in
+    bytes on macOS and in kilobytes everywhere else."""
+    try:
+        import resource
+    except ImportError:
+        return None
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    if sys.platform == 'darwin':
+        return peak
+    return peak * 1024
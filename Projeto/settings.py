@@ -8,6 +8,17 @@ class Settings:
         self.screen_height = 800
         self.bg_color = (230, 230, 230)  # set the background color
 
+        """The game is always drawn at the logical resolution above. The
+        display scaling decides how that image reaches the display:
+        None draws straight to the window, 'sdl' lets SDL scale it with the
+        SCALED flag and 'software' scales it with 'pygame.transform.scale'.
+        Fullscreen always scales, with 'sdl' unless 'software' is chosen."""
+        self.display_scaling = None
+        self.fullscreen = False
+        # Window size used by 'software' scaling when not in fullscreen.
+        self.display_width = 1200
+        self.display_height = 800
+
         # Ship settings
         self.ship_limit = 3
 
@@ -20,12 +31,48 @@ class Settings:
         # Alien settings
         self.fleet_drop_speed = 10
 
+        """Draw the fleet from one pre-composited surface instead of alien by
+        alien. It's faster, but the edges of an alien over a bullet are
+        drawn slightly differently, so it's off by default."""
+        self.composite_fleet = False
+
         # How quickly the game speeds up.
         self.speedup_scale = 1.1
 
         # How quickly the alien point values increase.
         self.score_scale = 1.5
 
+        # Autopilot settings, used to drive the game as a repeatable workload.
+        self.autopilot = False
+        self.autopilot_difficulty = 'Medium'
+        self.autopilot_frames = None  # None keeps the autopilot playing forever
+
+        """While the menu is showing, wait for events instead of redrawing
+        it on every pass through the loop. The timeout is in milliseconds."""
+        self.idle_menu = True
+        self.idle_timeout = 500
+
+        # Headless mode runs the game without opening a window.
+        self.headless = False
+
+        # Recording settings, 'r' starts and stops a recording.
+        self.capture_enabled = False  # record from the moment the game starts
+        self.capture_format = 'png'  # 'png' for a PNG sequence or 'gif'
+        self.capture_dir = 'recordings'
+        self.capture_every = 2  # record one frame out of every 'capture_every'
+        # Shared memory for frames waiting for the encoder, 32 MB is 8 frames.
+        self.capture_buffer_bytes = 32 * 1024 * 1024
+        self.capture_frame_duration = 40  # milliseconds per frame of a GIF
+        # A GIF keeps the last 'capture_gif_frames' frames, scaled down.
+        self.capture_gif_frames = 150
+        self.capture_gif_scale = 0.5
+
+        # Metrics settings, served on localhost and written as JSON lines.
+        self.metrics_enabled = False
+        self.metrics_port = 9108
+        self.metrics_snapshot_path = 'metrics.jsonl'  # None disables snapshots
+        self.metrics_snapshot_interval = 10.0  # seconds between snapshots
+
         self.initialize_dynamic_settings()
 
     def initialize_dynamic_settings(self):
@@ -39,6 +86,9 @@ class Settings:
         # fleet_direction of 1 represents 'right'; -1 represents 'left'
         self.fleet_direction = 1
 
+        # How far the fleet has moved sideways since it was created.
+        self.fleet_offset = 0.0
+
         # Scoring.
         self.alien_points = 50
 
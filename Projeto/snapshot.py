@@ -0,0 +1,125 @@
+import struct
+from array import array
+
+import pygame
+
+from ProjetoAlienInvasion.Projeto.alien import Alien
+from ProjetoAlienInvasion.Projeto.bullet import Bullet
+
+"""A snapshot is a fixed size header followed by the positions of every
+alien and bullet, stored as doubles:
+- the header holds the game statistics, the dynamic settings, the ship
+  and the number of aliens and bullets;
+- each alien is stored as (x, rect.y), where x is its position inside the
+  fleet, and each bullet as (rect.x, y)."""
+MAGIC = b'AISV'
+VERSION = 2
+HEADER = struct.Struct('<4sBiqi?dddbdqddd??II')
+
+
+def save_state(ai_game):
+    """Return the full state of the game as bytes."""
+    stats = ai_game.stats
+    settings = ai_game.settings
+    ship = ai_game.ship
+    aliens = ai_game.aliens.sprites()
+    bullets = ai_game.bullets.sprites()
+
+    header = HEADER.pack(
+        MAGIC, VERSION,
+        stats.ships_left, stats.score, stats.level, stats.game_active,
+        settings.ship_speed, settings.bullet_speed, settings.alien_speed,
+        settings.fleet_direction, settings.fleet_offset, settings.alien_points,
+        settings.speedup_scale,
+        ship.x, float(ship.rect.y), ship.moving_right, ship.moving_left,
+        len(aliens), len(bullets))
+
+    positions = array('d')
+    for alien in aliens:
+        positions.append(alien.x)
+        positions.append(alien.rect.y)
+    for bullet in bullets:
+        positions.append(bullet.rect.x)
+        positions.append(bullet.y)
+
+    return header + positions.tobytes()
+
+
+def load_state(ai_game, data):
+    """Restore the game to the state saved in 'data'."""
+    if len(data) < HEADER.size:
+        raise ValueError('Not an Alien Invasion snapshot.')
+
+    (magic, version,
+     ships_left, score, level, game_active,
+     ship_speed, bullet_speed, alien_speed, fleet_direction, fleet_offset,
+     alien_points, speedup_scale,
+     ship_x, ship_y, moving_right, moving_left,
+     alien_count, bullet_count) = HEADER.unpack_from(data)
+
+    if magic != MAGIC or version != VERSION:
+        raise ValueError('Not an Alien Invasion snapshot.')
+
+    positions = array('d')
+    positions.frombytes(data[HEADER.size:])
+    if len(positions) != 2 * (alien_count + bullet_count):
+        raise ValueError('The snapshot is incomplete.')
+
+    stats = ai_game.stats
+    stats.ships_left = ships_left
+    stats.score = score
+    stats.level = level
+    stats.game_active = game_active
+
+    settings = ai_game.settings
+    settings.ship_speed = ship_speed
+    settings.bullet_speed = bullet_speed
+    settings.alien_speed = alien_speed
+    settings.fleet_direction = fleet_direction
+    settings.fleet_offset = fleet_offset
+    settings.alien_points = alien_points
+    settings.speedup_scale = speedup_scale
+
+    ship = ai_game.ship
+    ship.x = ship_x
+    ship.rect.x = ship_x
+    ship.rect.y = ship_y
+    ship.moving_right = moving_right
+    ship.moving_left = moving_left
+
+    """We reuse the sprites already in the groups and only create or
+    remove the difference, which is much faster than building new
+    groups from scratch."""
+    aliens = _resize_group(ai_game, ai_game.aliens, Alien, alien_count)
+    for index, alien in enumerate(aliens):
+        alien.x = positions[2 * index]
+        alien.rect.x = alien.x + round(fleet_offset)
+        alien.rect.y = positions[2 * index + 1]
+
+    offset = 2 * alien_count
+    bullets = _resize_group(ai_game, ai_game.bullets, Bullet, bullet_count)
+    for index, bullet in enumerate(bullets):
+        bullet.rect.x = positions[offset + 2 * index]
+        bullet.y = positions[offset + 2 * index + 1]
+        bullet.rect.y = bullet.y
+
+    """Update everything that is drawn from the restored state. The fleet
+    surface is only rebuilt when it's next drawn, so loading several
+    snapshots in a row doesn't composite the fleet each time."""
+    ai_game.fleet_surface.dirty = True
+    ai_game.sb.prep_score()
+    ai_game.sb.prep_level()
+    ai_game.sb.prep_ships()
+    ai_game.sb.check_high_score()
+    ai_game.menu_dirty = True
+    pygame.mouse.set_visible(not game_active)
+
+
+def _resize_group(ai_game, group, sprite_class, count):
+    """Add or remove sprites so the group holds 'count' of them."""
+    sprites = group.sprites()
+    for sprite in sprites[count:]:
+        group.remove(sprite)
+    for _ in range(count - len(sprites)):
+        group.add(sprite_class(ai_game))
+    return group.sprites()
@@ -0,0 +1,204 @@
+"""Run headless games played by the autopilot over a grid of settings.
+
+Each point of the grid is one set of 'Settings' overrides, for example
+'--set speedup_scale=1.1,1.2,1.3 --set bullets_allowed=3,5' gives six
+points. The points are played in parallel on a process pool, and the
+results are written to a CSV file with one row per point and a JSON file
+with the statistics of every value of every setting.
+
+Run it from this folder, like the game, so the images and the high score
+file can be found."""
+
+import os
+import sys
+import csv
+import json
+import argparse
+import itertools
+from functools import partial
+from concurrent.futures import ProcessPoolExecutor
+from time import perf_counter
+
+from ProjetoAlienInvasion.Projeto.settings import Settings
+from ProjetoAlienInvasion.Projeto.alien_invasion import AlienInvasion
+
+
+def build_grid(values):
+    """Return every combination of the values given for each setting."""
+    names = list(values)
+    return [dict(zip(names, combination))
+            for combination in itertools.product(*values.values())]
+
+
+def play(overrides, max_frames):
+    """Play one headless game with 'overrides' applied to the settings."""
+    settings = Settings()
+    settings.headless = True
+    settings.autopilot = True
+
+    # Nothing is drawn, so there's no need to composite the fleet.
+    settings.composite_fleet = False
+
+    for name, value in overrides.items():
+        if not hasattr(settings, name):
+            raise ValueError(f"Unknown setting '{name}'.")
+        setattr(settings, name, value)
+
+    ai_game = AlienInvasion(settings)
+
+    """Starting the game through the difficulty buttons would reset
+    'speedup_scale', so we start it here the same way and apply the
+    overrides again, after the dynamic settings have been initialized."""
+    settings.initialize_dynamic_settings()
+    for name, value in overrides.items():
+        setattr(settings, name, value)
+    ai_game._start_game()
+
+    # Play until the game is over, or we run out of frames.
+    frames = 0
+    while ai_game.stats.game_active and frames < max_frames:
+        ai_game.autopilot.update()
+        ai_game.ship.update()
+        ai_game._update_bullets()
+        ai_game._update_aliens()
+        frames += 1
+
+    result = dict(overrides)
+    result.update({
+        'score': ai_game.stats.score,
+        'level': ai_game.stats.level,
+        'frames': frames,
+        'survived': int(ai_game.stats.game_active),
+        'ships_lost': settings.ship_limit - ai_game.stats.ships_left,
+    })
+    return result
+
+
+def summarize(results, names):
+    """Return score, level and survival statistics for every setting value."""
+    summary = {}
+    for name in names:
+        groups = {}
+        for result in results:
+            groups.setdefault(result[name], []).append(result)
+
+        summary[name] = {}
+        for value, group in sorted(groups.items()):
+            summary[name][str(value)] = {
+                'games': len(group),
+                'survival_rate': sum(r['survived'] for r in group) / len(group),
+                'mean_frames': sum(r['frames'] for r in group) / len(group),
+                'mean_score': sum(r['score'] for r in group) / len(group),
+                'max_score': max(r['score'] for r in group),
+                'mean_level': sum(r['level'] for r in group) / len(group),
+                'max_level': max(r['level'] for r in group),
+            }
+    return summary
+
+
+def check_effects(results, names):
+    """Return warnings about settings that didn't change any game."""
+    """A setting has no effect when every set of games that differ only
+    in that setting ended the same way. Statistics about such a setting,
+    or about levels when no game got past the first one, mean nothing."""
+    outcome = ('score', 'level', 'frames', 'survived', 'ships_lost')
+    warnings = []
+    for name in names:
+        # A setting that only had one value wasn't really swept.
+        if len({result[name] for result in results}) < 2:
+            continue
+
+        groups = {}
+        for result in results:
+            others = tuple(result[other] for other in names if other != name)
+            groups.setdefault(others, set()).add(
+                tuple(result[key] for key in outcome))
+        if all(len(outcomes) == 1 for outcomes in groups.values()):
+            warnings.append(f"Sweeping '{name}' had no effect on any game.")
+
+    if all(result['level'] == 1 for result in results):
+        warnings.append('Every game ended at level 1, so the level '
+                        'statistics tell us nothing.')
+    return warnings
+
+
+def parse_value(text):
+    """Turn a value from the command line into an int, float or string."""
+    for kind in (int, float):
+        try:
+            return kind(text)
+        except ValueError:
+            pass
+    return text
+
+
+def parse_args():
+    """Read the command line options of the sweep."""
+    parser = argparse.ArgumentParser(
+        description='Sweep Alien Invasion settings with headless games.')
+    parser.add_argument('--grid', default=None,
+                        help='JSON file mapping setting names to lists of values')
+    parser.add_argument('--set', action='append', default=[],
+                        metavar='NAME=V1,V2', dest='values',
+                        help='values to sweep for one setting')
+    parser.add_argument('--max-frames', type=int, default=50000,
+                        help='stop a game that lasts longer than this')
+    parser.add_argument('--workers', type=int, default=None,
+                        help='number of processes, one per CPU by default')
+    parser.add_argument('--output', default='sweep',
+                        help="prefix of the '.csv' and '.json' result files")
+    parser.add_argument('--strict', action='store_true',
+                        help='fail if a swept setting had no effect')
+    return parser.parse_args()
+
+
+def main():
+    """Run the sweep and write its results."""
+    args = parse_args()
+
+    values = {}
+    if args.grid:
+        with open(args.grid) as f:
+            values.update(json.load(f))
+    for option in args.values:
+        name, _, text = option.partition('=')
+        values[name] = [parse_value(value) for value in text.split(',')]
+    if not values:
+        raise SystemExit('Nothing to sweep, use --grid or --set.')
+
+    grid = build_grid(values)
+    workers = args.workers or os.cpu_count()
+    print(f"Playing {len(grid)} games on {workers} processes...")
+
+    """The games don't share anything, so each process plays its own
+    share of the grid. Sending the points in chunks keeps the pool from
+    spending more time passing messages than playing."""
+    start = perf_counter()
+    chunksize = max(1, len(grid) // (workers * 4))
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        results = list(executor.map(partial(play, max_frames=args.max_frames),
+                                    grid, chunksize=chunksize))
+    elapsed = perf_counter() - start
+
+    with open(args.output + '.csv', 'w', newline='') as f:
+        writer = csv.DictWriter(f, fieldnames=list(results[0]))
+        writer.writeheader()
+        writer.writerows(results)
+
+    warnings = check_effects(results, list(values))
+    summary = summarize(results, list(values))
+    summary['warnings'] = warnings
+    with open(args.output + '.json', 'w') as f:
+        json.dump(summary, f, indent=4)
+
+    print(f"Played {len(grid)} games in {elapsed:.1f}s, results written to "
+          f"{args.output}.csv and {args.output}.json")
+
+    for warning in warnings:
+        print(f"Warning: {warning}", file=sys.stderr)
+    if warnings and args.strict:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main()